@@ -1,10 +1,154 @@
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import streamlit as st
 import time
+import random
 import logging
 import os
-from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+# Faster JSON decoding for API responses
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Fields extracted for every candidate, in display order
+RESUME_FIELDS = (
+    'first_name', 'last_name', 'mobile', 'email',
+    'current_job_title', 'current_company',
+    'previous_job_title', 'previous_company'
+)
+
+# OpenRouter model used for every request
+MODEL_NAME = "deepseek/deepseek-chat-v3-0324"
+
+# Bump whenever the prompts change so cached parses from older prompts
+# are not reused
+PROMPT_VERSION = 1
+
+# Completion token budget per resume in a batched request
+BATCH_MAX_TOKENS_PER_RESUME = 300
+
+# Request timeout in seconds for a single resume, plus the extra allowed
+# for each further resume in a batched request
+API_TIMEOUT = 30
+BATCH_TIMEOUT_PER_RESUME = 15
+
+# Backoff bounds in seconds for retried API calls; rate limits without a
+# Retry-After header wait at least RATE_LIMIT_DEFAULT_WAIT
+RETRY_BASE_DELAY = 2.0
+RETRY_MAX_DELAY = 30.0
+RATE_LIMIT_DEFAULT_WAIT = 5.0
+
+# Static instructions go in the system message and the resume text in the
+# user message, so consecutive requests share a byte-identical prefix that
+# the provider's prompt cache can reuse
+SYSTEM_PROMPT = """Extract resume data from the user's message as JSON only.
+
+Return only:
+{
+    "first_name": "",
+    "last_name": "", 
+    "mobile": "",
+    "email": "",
+    "current_job_title": "",
+    "current_company": "",
+    "previous_job_title": "", 
+    "previous_company": ""
+}
+
+Most recent job = current. Use "" if not found."""
+
+BATCH_SYSTEM_PROMPT = """You are an expert resume parser. Extract structured information from the resumes in the user's message and return ONLY a valid JSON array.
+
+Return ONLY a JSON array with one object per resume (no markdown, no explanations):
+[
+    {
+        "index": 1,
+        "first_name": "candidate first name",
+        "last_name": "candidate last name",
+        "mobile": "phone/mobile number", 
+        "email": "email address",
+        "current_job_title": "most recent job title",
+        "current_company": "most recent company name",
+        "previous_job_title": "previous job title",
+        "previous_company": "previous company name"
+    }
+]
+
+Rules:
+1. Return ONLY valid JSON array - no markdown, no explanations
+2. One object per resume in order, with "index" set to its RESUME number
+3. If information not found, use empty string ""
+4. Identify current vs previous by dates"""
+
+
+def _json_loads(data):
+    """Decode JSON from str or bytes, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Process-wide LRU cache of successful parses keyed by a hash of the model,
+# prompt version and resume text, so re-uploading a resume on a later run
+# skips the API call
+PARSE_CACHE_SIZE = 512
+_parse_cache = OrderedDict()
+_parse_cache_lock = threading.Lock()
+
+
+def _parse_cache_key(resume_text):
+    keyed_text = f"{MODEL_NAME}|{PROMPT_VERSION}|{resume_text}"
+    return hashlib.sha256(keyed_text.encode('utf-8')).hexdigest()
+
+
+def _parse_cache_get(key):
+    """Return a copy of the cached parse for key, or None"""
+    with _parse_cache_lock:
+        data = _parse_cache.get(key)
+        if data is None:
+            return None
+        _parse_cache.move_to_end(key)
+        return dict(data)
+
+
+def _parse_cache_put(key, data):
+    """Cache a parse result unless it came back empty"""
+    if not any(data.values()):
+        return
+    with _parse_cache_lock:
+        _parse_cache[key] = dict(data)
+        _parse_cache.move_to_end(key)
+        if len(_parse_cache) > PARSE_CACHE_SIZE:
+            _parse_cache.popitem(last=False)
+
+
+class APIRequestError(Exception):
+    """A failed API call, flagged with whether it is worth retrying"""
+    
+    def __init__(self, message, retriable=False, rate_limited=False, retry_after=None,
+                 timed_out=False):
+        super().__init__(message)
+        self.retriable = retriable
+        self.rate_limited = rate_limited
+        self.retry_after = retry_after
+        self.timed_out = timed_out
+
+
+def _parse_retry_after(value):
+    """Seconds from a Retry-After header, or None if absent or not numeric"""
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
 
 class AIParser:
     """Enhanced DeepSeek V3 API integration with improved error handling and debugging"""
@@ -28,26 +172,53 @@ class AIParser:
             "X-Title": "Resume Parser"
         }
         
+        # Reuse one keep-alive connection pool for all API calls instead of
+        # opening a new TLS connection per request
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=16)
+        self.session.mount("https://", adapter)
+        
         self.logger = logging.getLogger(__name__)
-        self.debug_mode = os.getenv("DEBUG_MODE", "false").lower() == "true"
+        # The parser is shared across sessions, so debug mode is set per
+        # call and held per thread rather than fixed at construction
+        self._call_state = threading.local()
         self.api_call_count = 0  # Track API calls for rate limit debugging
         
         # Test the API connection
         self._test_connection()
     
+    @property
+    def debug_mode(self):
+        """Debug mode of the call running on this thread, defaulting to DEBUG_MODE"""
+        debug_mode = getattr(self._call_state, 'debug_mode', None)
+        if debug_mode is None:
+            return os.getenv("DEBUG_MODE", "false").lower() == "true"
+        return debug_mode
+    
+    @contextmanager
+    def _debug_scope(self, debug_mode):
+        """Apply debug_mode to this thread for the duration of one call"""
+        previous = getattr(self._call_state, 'debug_mode', None)
+        if debug_mode is not None:
+            self._call_state.debug_mode = debug_mode
+        try:
+            yield
+        finally:
+            self._call_state.debug_mode = previous
+    
     def _test_connection(self):
         """Test the OpenRouter API connection with DeepSeek V3 and check for rate limits"""
         try:
             test_payload = {
-                "model": "deepseek/deepseek-chat-v3-0324",
+                "model": MODEL_NAME,
                 "messages": [{"role": "user", "content": "Hello"}],
                 "max_tokens": 10,
                 "temperature": 0.1
             }
             
-            response = requests.post(
+            response = self.session.post(
                 self.base_url,
-                headers=self.headers,
                 json=test_payload,
                 timeout=10
             )
@@ -71,17 +242,24 @@ class AIParser:
                 st.error("❌ DeepSeek API rate limit active. Wait 5-10 minutes before trying again.")
             raise Exception(f"OpenRouter API connection test failed: {str(e)}")
     
-    def parse_resume(self, resume_text, filename="unknown"):
+    def parse_resume(self, resume_text, filename="unknown", debug_mode=None):
         """
         Parse resume text using DeepSeek V3 API with enhanced error handling
         
         Args:
             resume_text: Raw text extracted from resume
             filename: Name of the source file for logging
+            debug_mode: Show debug output for this call; None keeps the
+                current setting
             
         Returns:
             Structured resume data as dictionary
         """
+        with self._debug_scope(debug_mode):
+            return self._parse_single(resume_text, filename)
+
+    def _parse_single(self, resume_text, filename):
+        """Parse one resume, using the parse cache when possible"""
         if not resume_text or not resume_text.strip():
             self.logger.warning(f"Empty resume text provided for {filename}")
             return self._create_empty_structure()
@@ -94,6 +272,12 @@ class AIParser:
             self.logger.warning(f"Resume text too short for {filename}: {text_length} characters")
             return self._create_empty_structure()
             
+        cache_key = _parse_cache_key(resume_text)
+        cached = _parse_cache_get(cache_key)
+        if cached is not None:
+            self.logger.info(f"Using cached parse for {filename}")
+            return cached
+            
         # Create prompt for resume parsing
         prompt = self._create_single_prompt(resume_text)
         
@@ -104,206 +288,174 @@ class AIParser:
         response = self._make_api_call_with_retry(prompt, filename)
             
         if response:
-            return self._parse_api_response(response, filename)
+            parsed_data = self._parse_api_response(response, filename)
+            _parse_cache_put(cache_key, parsed_data)
+            return parsed_data
         else:
             self.logger.error(f"No response from AI API for {filename} - Check debug logs for details")
             if self.debug_mode:
                 st.error(f"❌ No AI response for {filename}. Check API connection or rate limits.")
             return self._create_empty_structure()
 
-    def parse_resume_batch(self, resume_texts):
+    def parse_resume_batch(self, resumes, debug_mode=None):
         """
-        Parse multiple resumes in a single API call
+        Parse several resumes in one API call, falling back to single calls
+        for any resume the batch response does not cover
         
         Args:
-            resume_texts: List of resume text strings
+            resumes: List of (filename, resume_text) tuples
+            debug_mode: Show debug output for this call; None keeps the
+                current setting
             
         Returns:
-            List of parsed resume data dictionaries
+            List of parsed resume data dictionaries, in input order
         """
-        try:
-            if not resume_texts:
-                return []
+        results = [_parse_cache_get(_parse_cache_key(text)) for _, text in resumes]
+        misses = [i for i, data in enumerate(results) if data is None]
+        
+        if misses:
+            with self._debug_scope(debug_mode):
+                parsed_list = self._parse_uncached_batch([resumes[i] for i in misses])
+            for i, parsed_data in zip(misses, parsed_list):
+                results[i] = parsed_data
                 
-            # Filter out empty texts
-            valid_texts = [text for text in resume_texts if text and text.strip()]
-            
-            if not valid_texts:
-                self.logger.warning("No valid resume texts in batch")
-                return [self._create_empty_structure() for _ in resume_texts]
-            
-            # Build prompt with multiple resumes 
-            prompt = self._create_batch_prompt(valid_texts)
+        return results
 
-            # Call API 
-            response = self._make_api_call_with_retry(prompt, f"batch_{len(valid_texts)}")
+    def _parse_uncached_batch(self, resumes):
+        """Send resumes that missed the parse cache to the API as one batch"""
+        if not resumes:
+            return []
             
-            if response: 
-                return self._parse_batch_api_response(response, expected_count=len(resume_texts))
-            else: 
-                return [self._create_empty_structure() for _ in resume_texts] 
-                
-        except Exception as e:
-            self.logger.error(f"Error parsing batch resumes: {str(e)}")
-            st.error(f"❌ Error parsing batch resumes: {str(e)}")
-            return [self._create_empty_structure() for _ in resume_texts]
-
-    def parse_resumes_in_parallel(self, all_resumes, batch_size=3, max_workers=8):
-        """
-        Parse resumes in parallel with smaller batches and reduced workers for stability
-        
-        Args:
-            all_resumes: List of resume texts
-            batch_size: Number of resumes per batch (reduced for stability)
-            max_workers: Maximum number of concurrent workers (reduced)
+        if len(resumes) == 1:
+            filename, resume_text = resumes[0]
+            return [self._parse_single(resume_text, filename)]
             
-        Returns:
-            List of parsed resume data
-        """
-        results = []
+        context = f"batch of {len(resumes)} starting with {resumes[0][0]}"
+        prompt = self._create_batch_prompt([text for _, text in resumes])
         
+        if self.debug_mode:
+            st.info(f"🤖 Sending {len(prompt)} character batch prompt to AI for {context}")
+            
+        # Resumes fall back to single calls only when the batch timed out or
+        # its response could not be decoded; rate limits and client errors
+        # would just fail again once per resume
+        items = None
         try:
-            with ThreadPoolExecutor(max_workers=max_workers) as executor: 
-                futures = [
-                    executor.submit(self.parse_resume_batch, all_resumes[i:i+batch_size])
-                    for i in range(0, len(all_resumes), batch_size) 
-                ]
+            response = self._make_api_call_with_retry(
+                prompt, context, max_tokens=BATCH_MAX_TOKENS_PER_RESUME * len(resumes),
+                system_prompt=BATCH_SYSTEM_PROMPT,
+                timeout=API_TIMEOUT + BATCH_TIMEOUT_PER_RESUME * (len(resumes) - 1),
+                raise_errors=True)
+            if not response:
+                self.logger.error(f"No response from AI API for {context} - Check debug logs for details")
+                return [self._create_empty_structure() for _ in resumes]
+            items = self._extract_batch_items(response, len(resumes))
+        except APIRequestError as e:
+            if not e.timed_out:
+                self.logger.error(f"AI API failed for {context}: {str(e)}")
+                return [self._create_empty_structure() for _ in resumes]
+            self.logger.error(f"AI API timed out for {context}, parsing its resumes individually")
+        
+        results = []
+        for i, (filename, resume_text) in enumerate(resumes):
+            if items is not None and items[i] is not None:
+                parsed_data = self._validate_parsed_data(items[i])
+                _parse_cache_put(_parse_cache_key(resume_text), parsed_data)
+                results.append(parsed_data)
+            else:
+                if items is not None:
+                    self.logger.warning(f"Batch response missing {filename}, parsing it individually")
+                results.append(self._parse_single(resume_text, filename))
                 
-                for i, future in enumerate(futures):
-                    try:
-                        batch_results = future.result(timeout=120)  # 2 minute timeout per batch
-                        results.extend(batch_results)
-                        self.logger.info(f"Completed batch {i+1}/{len(futures)}")
-                    except Exception as e:
-                        self.logger.error(f"Batch {i+1} failed: {str(e)}")
-                        # Add empty structures for failed batch
-                        batch_start = i * batch_size
-                        batch_end = min((i + 1) * batch_size, len(all_resumes))
-                        results.extend([self._create_empty_structure() for _ in range(batch_end - batch_start)])
-                        
-        except Exception as e:
-            self.logger.error(f"Error in parallel processing: {str(e)}")
-            return [self._create_empty_structure() for _ in all_resumes]
-            
-        return results 
+        return results
 
     def _create_single_prompt(self, resume_text): 
-        """Create optimized prompt for single resume parsing"""
+        """Create the user message for single resume parsing"""
         max_chars = 8000  # Further reduced to ensure API stability with larger batches
         if len(resume_text) > max_chars: 
             resume_text = resume_text[:max_chars] + "..."
             
-        prompt = f"""Extract resume data as JSON only:
-
-{resume_text}
-
-Return only:
-{{
-    "first_name": "",
-    "last_name": "", 
-    "mobile": "",
-    "email": "",
-    "current_job_title": "",
-    "current_company": "",
-    "previous_job_title": "", 
-    "previous_company": ""
-}}
-
-Most recent job = current. Use "" if not found."""
-        
-        return prompt
+        return resume_text
     
     def _create_batch_prompt(self, resume_texts):
-        """Create optimized prompt for batch resume parsing"""
+        """Create the user message for batch resume parsing"""
         max_chars = 10000  # Further reduced for batch processing
         truncated_resumes = [] 
         
         for i, text in enumerate(resume_texts, start=1):
             if len(text) > max_chars:
                 text = text[:max_chars] + "..." 
-            truncated_resumes.append(f"Resume {i}:\n{text}\n")
-        
-        prompt = f"""You are an expert resume parser. Extract structured information from these resumes and return ONLY a valid JSON array.
-
-{' '.join(truncated_resumes)}
-
-Return ONLY a JSON array with one object per resume (no markdown, no explanations):
-[
-    {{
-        "first_name": "candidate first name",
-        "last_name": "candidate last name",
-        "mobile": "phone/mobile number", 
-        "email": "email address",
-        "current_job_title": "most recent job title",
-        "current_company": "most recent company name",
-        "previous_job_title": "previous job title",
-        "previous_company": "previous company name"
-    }}
-]
-
-Rules:
-1. Return ONLY valid JSON array - no markdown, no explanations
-2. One object per resume in order
-3. If information not found, use empty string ""
-4. Identify current vs previous by dates"""
+            truncated_resumes.append(f"\n---RESUME {i}---\n{text}\n")
         
-        return prompt
+        return ' '.join(truncated_resumes)
     
-    def _make_api_call_with_retry(self, prompt, context, max_retries=3):
+    def _make_api_call_with_retry(self, prompt, context, max_retries=3, max_tokens=1000,
+                                  system_prompt=SYSTEM_PROMPT, timeout=API_TIMEOUT,
+                                  raise_errors=False):
         """
-        Make API call with intelligent rate limiting and retry logic
+        Make API call with exponential backoff, retrying only rate limits,
+        timeouts, connection errors and server-side failures
+        
+        Returns the response content, or None on failure; with raise_errors
+        the final APIRequestError is raised instead so callers can tell
+        why the call failed
         """
         for attempt in range(max_retries):
             try:
-                response = self._make_api_call(prompt)
-                if response:
-                    return response
-                    
-            except Exception as e:
-                error_str = str(e).lower()
+                return self._make_api_call(prompt, max_tokens=max_tokens,
+                                           system_prompt=system_prompt,
+                                           timeout=timeout)
+            except APIRequestError as e:
                 self.logger.error(f"API attempt {attempt + 1} failed for {context}: {str(e)}")
                 
                 # Log full error details for debugging
                 if self.debug_mode:
                     st.error(f"API Error (attempt {attempt + 1}): {str(e)}")
                 
-                # Check for rate limiting
-                if "rate limit" in error_str or "429" in error_str:
-                    wait_time = 5 + (attempt * 3)  # Progressive backoff for rate limits
-                    self.logger.info(f"Rate limit detected, waiting {wait_time} seconds...")
-                    if self.debug_mode:
-                        st.warning(f"Rate limit hit, waiting {wait_time} seconds...")
-                    time.sleep(wait_time)
-                elif "timeout" in error_str:
-                    wait_time = 2 + attempt  # Shorter wait for timeouts
-                    time.sleep(wait_time)
-                else:
-                    wait_time = 1 + attempt  # Standard retry wait
-                    time.sleep(wait_time)
-                
-                if attempt == max_retries - 1:
-                    if "rate limit" in error_str or "429" in error_str:
+                if not e.retriable or attempt == max_retries - 1:
+                    if e.rate_limited:
                         st.warning(f"⚠️ Rate limit reached for {context}. Consider reducing concurrent workers.")
                     else:
-                        st.error(f"❌ AI API failed after {max_retries} attempts for {context}: {str(e)}")
+                        st.error(f"❌ AI API failed after {attempt + 1} attempt(s) for {context}: {str(e)}")
+                    if raise_errors:
+                        raise
                     return None
+                    
+                wait_time = self._retry_delay(attempt, e.retry_after)
+                self.logger.info(f"Retrying {context} in {wait_time:.1f} seconds...")
+                if e.rate_limited and self.debug_mode:
+                    st.warning(f"Rate limit hit, waiting {wait_time:.1f} seconds...")
+                time.sleep(wait_time)
         
         return None
     
-    def _make_api_call(self, prompt):
+    def _retry_delay(self, attempt, retry_after=None):
+        """Exponential backoff with jitter, never shorter than a server-sent Retry-After"""
+        delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt)
+        delay = random.uniform(delay / 2, delay)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, RETRY_MAX_DELAY))
+        return delay
+    
+    def _make_api_call(self, prompt, max_tokens=1000, system_prompt=SYSTEM_PROMPT,
+                       timeout=API_TIMEOUT):
         """
         Make API call to DeepSeek V3 with improved error handling
         """
         try:
             payload = {
-                "model": "deepseek/deepseek-chat-v3-0324",
+                "model": MODEL_NAME,
                 "messages": [
+                    {
+                        "role": "system",
+                        "content": system_prompt
+                    },
                     {
                         "role": "user",
                         "content": prompt
                     }
                 ],
-                "max_tokens": 1000,  # Minimal tokens for fastest response
+                "max_tokens": max_tokens,  # Minimal tokens for fastest response
                 "temperature": 0.05,  # Lower temperature for faster, more consistent responses
                 "stream": False
             }
@@ -315,11 +467,10 @@ Rules:
             # Small delay to respect DeepSeek API rate limits
             time.sleep(0.1)  # 100ms delay between requests
             
-            response = requests.post(
+            response = self.session.post(
                 self.base_url,
-                headers=self.headers,
                 json=payload,
-                timeout=30  # Fast timeout for quick processing
+                timeout=timeout
             )
             
             # Log response details for debugging
@@ -328,14 +479,20 @@ Rules:
                 st.info(f"API Response: Status {response.status_code}")
             
             if response.status_code == 200:
-                result = response.json()
-                content = result.get("choices", [{}])[0].get("message", {}).get("content", "")
+                # Decode straight from the raw body bytes
+                result = _json_loads(response.content)
+                choices = result.get("choices") or [{}]
+                content = choices[0].get("message", {}).get("content", "")
                 
                 if not content:
+                    # Empty or error-only 200 replies are usually transient
+                    # provider hiccups, so they are retried with backoff
                     self.logger.error("Empty content in API response")
                     if self.debug_mode:
                         st.error(f"❌ Empty response from API - full response: {result}")
-                    return None
+                    error_detail = f": {result['error']}" if result.get("error") else ""
+                    raise APIRequestError(f"Empty content in API response{error_detail}",
+                                          retriable=True)
                 
                 if self.debug_mode:
                     st.success(f"✅ API returned {len(content)} characters")
@@ -360,7 +517,10 @@ Rules:
                     self.logger.error(f"Rate limit retry-after header: {retry_after}")
                 
                 st.error(error_msg)
-                raise Exception("Rate limit exceeded (429)")
+                retry_after = _parse_retry_after(response.headers.get('retry-after'))
+                raise APIRequestError(
+                    "Rate limit exceeded (429)", retriable=True, rate_limited=True,
+                    retry_after=RATE_LIMIT_DEFAULT_WAIT if retry_after is None else retry_after)
             else:
                 error_msg = f"DeepSeek API error: {response.status_code}"
                 try:
@@ -368,14 +528,18 @@ Rules:
                     error_msg += f" - {error_detail}"
                 except:
                     error_msg += f" - {response.text}"
-                raise Exception(error_msg)
+                # Server-side failures may clear up; other client errors will not
+                raise APIRequestError(
+                    error_msg, retriable=response.status_code >= 500 or response.status_code == 408)
                 
+        except APIRequestError:
+            raise
         except requests.exceptions.Timeout:
-            raise Exception("DeepSeek API request timed out")
+            raise APIRequestError("DeepSeek API request timed out", retriable=True, timed_out=True)
         except requests.exceptions.RequestException as e:
-            raise Exception(f"Network error calling DeepSeek API: {str(e)}")
+            raise APIRequestError(f"Network error calling DeepSeek API: {str(e)}", retriable=True)
         except Exception as e:
-            raise Exception(f"Error calling DeepSeek API: {str(e)}")
+            raise APIRequestError(f"Error calling DeepSeek API: {str(e)}")
     
     def _parse_api_response(self, response_text, filename="unknown"):
         """Parse single resume API response with better error handling"""
@@ -402,7 +566,7 @@ Rules:
                 st.text(f"Cleaned response for {filename}:")
                 st.code(response_text, language="json")
             
-            data = json.loads(response_text)
+            data = _json_loads(response_text)
             
             if isinstance(data, list) and len(data) > 0:
                 data = data[0]  # Take first item if it's a list
@@ -419,8 +583,15 @@ Rules:
             self.logger.error(f"Error parsing API response for {filename}: {str(e)}")
             return self._create_empty_structure()
     
-    def _parse_batch_api_response(self, response_text, expected_count):
-        """Parse batch API response with improved error handling"""
+    def _extract_batch_items(self, response_text, expected_count):
+        """
+        Decode a batch API response into one raw item per resume
+        
+        Returns:
+            List of length expected_count holding the parsed dict for each
+            resume or None where the response has no entry for it, or None
+            if the response could not be decoded at all
+        """
         try:
             # Clean up response text
             response_text = response_text.strip()
@@ -433,31 +604,36 @@ Rules:
             if response_text.endswith("```"):
                 response_text = response_text[:-3].strip()
 
-            data = json.loads(response_text)
+            data = _json_loads(response_text)
 
             # Ensure data is a list
-            if not isinstance(data, list):
+            if isinstance(data, dict) and isinstance(data.get("results"), list):
+                data = data["results"]
+            elif not isinstance(data, list):
                 data = [data]  # Convert single dict to list
 
-            # Ensure exactly expected_count items 
-            results = []
-            for i in range(expected_count): 
-                if i < len(data) and isinstance(data[i], dict): 
-                    results.append(self._validate_parsed_data(data[i]))
-                else: 
-                    results.append(self._create_empty_structure())
+            # Place items by their "index" field, falling back to position
+            items = [None] * expected_count
+            for position, item in enumerate(data):
+                if not isinstance(item, dict):
+                    continue
+                index = item.get("index")
+                if isinstance(index, int) and 1 <= index <= expected_count:
+                    items[index - 1] = item
+                elif position < expected_count and items[position] is None:
+                    items[position] = item
                     
-            return results 
+            return items
             
         except json.JSONDecodeError as e: 
             self.logger.error(f"Batch JSON parsing failed: {str(e)}")
             if self.debug_mode:
                 st.error(f"❌ Batch JSON parsing failed")
                 st.code(response_text) 
-            return [self._create_empty_structure() for _ in range(expected_count)]
+            return None
         except Exception as e:
             self.logger.error(f"Error parsing batch API response: {str(e)}")
-            return [self._create_empty_structure() for _ in range(expected_count)]
+            return None
     
     def _validate_parsed_data(self, data):
         """Validate and clean parsed data"""
@@ -465,14 +641,8 @@ Rules:
             return self._create_empty_structure()
         
         # Ensure all required fields exist
-        required_fields = [
-            'first_name', 'last_name', 'mobile', 'email',
-            'current_job_title', 'current_company', 
-            'previous_job_title', 'previous_company'
-        ]
-        
         validated_data = {}
-        for field in required_fields:
+        for field in RESUME_FIELDS:
             value = data.get(field, "")
             # Clean the value
             if isinstance(value, str):
@@ -487,13 +657,4 @@ Rules:
     
     def _create_empty_structure(self):
         """Create empty resume data structure"""
-        return {
-            'first_name': '',
-            'last_name': '',
-            'mobile': '',
-            'email': '',
-            'current_job_title': '',
-            'current_company': '',
-            'previous_job_title': '',
-            'previous_company': ''
-        }
+        return dict.fromkeys(RESUME_FIELDS, '')
@@ -1,33 +1,91 @@
 import streamlit as st
 import pandas as pd
-import json
 import traceback
 from pdf_processor import PDFProcessor
 from word_processor import WordProcessor
 from ai_parser import AIParser
 from excel_exporter import ExcelExporter
 from debug_logger import DebugLogger
-import base64
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from itertools import islice
 import os
 import logging
+import threading
+import hashlib
+import time
+from dataclasses import dataclass
+from types import SimpleNamespace
+
+PAGE_TITLE = "Resume Parser & Analyzer"
+PAGE_ICON = "📄"
+APP_HEADER = "📄 Enhanced Resume Parser & Analyzer"
+APP_TAGLINE = "Road to Million Biller!!! 🚀"
+
+# Worker threads for per-file processing and cap on in-flight DeepSeek calls
+MAX_WORKERS = 8
+MAX_CONCURRENT_API_CALLS = 5
+
+# Cap on queued extractions so extracted text for large uploads is
+# produced only as fast as it can be consumed
+MAX_PENDING_EXTRACTIONS = 2 * MAX_WORKERS
+
+# Resumes sent to DeepSeek per API call, and the combined resume text
+# allowed in one request so large resumes go in smaller batches
+AI_BATCH_SIZE = 4
+AI_BATCH_CHAR_BUDGET = 30000
+
+# Minimum seconds between progress widget refreshes while processing
+PROGRESS_REFRESH_INTERVAL = 0.1
+
+# Seconds a resolved API key is reused before env/secrets are read again
+API_KEY_CACHE_TTL = 300
+
+# Accepted upload extensions and their size limits in bytes
+ALLOWED_EXTENSIONS = frozenset({'pdf', 'docx', 'doc'})
+MAX_FILE_SIZES = {'pdf': 50 << 20, 'docx': 10 << 20, 'doc': 10 << 20}
+
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# (column label, candidate field) pairs for the candidates table
+DISPLAY_COLUMNS = (
+    ('First Name', 'first_name'),
+    ('Last Name', 'last_name'),
+    ('Mobile', 'mobile'),
+    ('Email', 'email'),
+    ('Current Job Title', 'current_job_title'),
+    ('Current Company', 'current_company'),
+    ('Previous Job Title', 'previous_job_title'),
+    ('Previous Company', 'previous_company'),
+    ('Source File', 'filename'),
+)
+
+
+@dataclass(slots=True)
+class ResumeInput:
+    """An uploaded resume whose bytes have been read exactly once"""
+    name: str
+    ext: str
+    data: bytes
+
+    @property
+    def size(self):
+        return len(self.data)
 
 
 def main():
-    st.set_page_config(page_title="Resume Parser & Analyzer",
-                       page_icon="📄",
+    st.set_page_config(page_title=PAGE_TITLE,
+                       page_icon=PAGE_ICON,
                        layout="wide")
 
-    st.title("📄 Enhanced Resume Parser & Analyzer")
-    st.markdown("Road to Million Biller!!! 🚀")
+    st.title(APP_HEADER)
+    st.markdown(APP_TAGLINE)
 
     # Initialize session state
-    if 'processed_candidates' not in st.session_state:
-        st.session_state.processed_candidates = []
-    if 'processing_complete' not in st.session_state:
-        st.session_state.processing_complete = False
-    if 'processing_in_progress' not in st.session_state:
-        st.session_state.processing_in_progress = False
+    st.session_state.setdefault('processed_candidates', [])
+    st.session_state.setdefault('processing_complete', False)
+    st.session_state.setdefault('processing_in_progress', False)
+    st.session_state.setdefault('successful_count', 0)
+    st.session_state.setdefault('excel_report', None)
     if 'debug_logger' not in st.session_state:
         st.session_state.debug_logger = DebugLogger()
 
@@ -74,12 +132,9 @@ def main():
 
                 # Display uploaded files
                 with st.expander("📋 Valid Files", expanded=False):
-                    for i, file in enumerate(valid_files, 1):
-                        file_type = file.name.split('.')[-1].upper()
-                        file_size_mb = file.size / (1024 * 1024)
-                        st.write(
-                            f"{i}. {file.name} ({file_size_mb:.2f} MB) - {file_type}"
-                        )
+                    st.markdown("\n".join(
+                        f"{i}. {file.name} ({file.size / (1024 * 1024):.2f} MB) - {file.ext.upper()}"
+                        for i, file in enumerate(valid_files, 1)))
 
                 # Process files button
                 process_disabled = not credentials_status[
@@ -110,80 +165,89 @@ def main():
                       len(st.session_state.processed_candidates))
 
             # Show completion stats
-            successful_extractions = len([
-                c for c in st.session_state.processed_candidates if any([
-                    c.get('first_name'),
-                    c.get('email'),
-                    c.get('current_job_title')
-                ])
-            ])
-            st.metric("Successful Extractions", successful_extractions)
+            st.metric("Successful Extractions",
+                      st.session_state.successful_count)
 
             if st.session_state.processing_complete:
                 st.success("✅ Processing completed!")
 
-                if st.button("📊 Download Excel Report",
-                             type="secondary",
-                             use_container_width=True):
+                # The report is built when processing ends, so serve it directly
+                if st.session_state.excel_report is not None:
+                    st.download_button(
+                        label="📊 Download Excel Report",
+                        data=st.session_state.excel_report,
+                        file_name=st.session_state.excel_filename,
+                        mime=XLSX_MIME,
+                        type="secondary",
+                        use_container_width=True)
+                elif st.button("📊 Download Excel Report",
+                               type="secondary",
+                               use_container_width=True):
                     generate_and_download_excel()
         else:
             st.info("No candidates processed yet.")
 
     # Display processed candidates
     if st.session_state.processed_candidates:
-        st.header("👥 Processed Candidates")
-
-        # Filter options
-        col_filter1, col_filter2 = st.columns(2)
-        with col_filter1:
-            show_only_successful = st.checkbox(
-                "Show only successful extractions", value=False)
-        with col_filter2:
-            show_empty_fields = st.checkbox("Show empty fields", value=True)
-
-        # Create DataFrame for display
-        display_data = []
-        for i, candidate in enumerate(st.session_state.processed_candidates,
-                                      1):
-            # Check if extraction was successful
-            has_data = any([
-                candidate.get('first_name'),
-                candidate.get('email'),
-                candidate.get('current_job_title')
-            ])
-
-            if show_only_successful and not has_data:
-                continue
-
-            row_data = {
-                'Sr.': i,
-                'First Name': candidate.get('first_name', ''),
-                'Last Name': candidate.get('last_name', ''),
-                'Mobile': candidate.get('mobile', ''),
-                'Email': candidate.get('email', ''),
-                'Current Job Title': candidate.get('current_job_title', ''),
-                'Current Company': candidate.get('current_company', ''),
-                'Previous Job Title': candidate.get('previous_job_title', ''),
-                'Previous Company': candidate.get('previous_company', ''),
-                'Source File': candidate.get('filename', ''),
-                'Status': '✅ Success' if has_data else '❌ Failed'
+        display_processed_candidates()
+
+
+@st.fragment
+def display_processed_candidates():
+    """Render the candidates table; filter toggles only rerun this fragment"""
+    st.header("👥 Processed Candidates")
+
+    # Filter options
+    col_filter1, col_filter2 = st.columns(2)
+    with col_filter1:
+        show_only_successful = st.checkbox(
+            "Show only successful extractions", value=False)
+    with col_filter2:
+        show_empty_fields = st.checkbox("Show empty fields", value=True)
+
+    df = build_display_dataframe(st.session_state.processed_candidates,
+                                 show_only_successful, show_empty_fields)
+    if df is not None:
+        st.dataframe(df, use_container_width=True)
+    else:
+        st.info("No data to display with current filters.")
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def build_display_dataframe(candidates, show_only_successful,
+                            show_empty_fields):
+    """Build the candidates table, cached so unrelated reruns skip the rebuild"""
+    # Decide which rows to show first, then build one list per column
+    has_data = [
+        bool(candidate.get('first_name') or candidate.get('email')
+             or candidate.get('current_job_title'))
+        for candidate in candidates
+    ]
+    indices = [
+        i for i, ok in enumerate(has_data)
+        if ok or not show_only_successful
+    ]
+
+    if indices:
+        selected = [candidates[i] for i in indices]
+        columns = {'Sr.': [i + 1 for i in indices]}
+        for label, field in DISPLAY_COLUMNS:
+            columns[label] = [c.get(field, '') for c in selected]
+        columns['Status'] = [
+            '✅ Success' if has_data[i] else '❌ Failed' for i in indices
+        ]
+
+        if not show_empty_fields:
+            # Remove columns that are empty for every displayed candidate
+            columns = {
+                k: v
+                for k, v in columns.items()
+                if k in ('Sr.', 'Source File', 'Status') or any(v)
             }
 
-            if not show_empty_fields:
-                # Remove empty fields from display
-                row_data = {
-                    k: v
-                    for k, v in row_data.items()
-                    if v or k in ['Sr.', 'Source File', 'Status']
-                }
+        return pd.DataFrame(columns)
 
-            display_data.append(row_data)
-
-        if display_data:
-            df = pd.DataFrame(display_data)
-            st.dataframe(df, use_container_width=True)
-        else:
-            st.info("No data to display with current filters.")
+    return None
 
 
 def validate_uploaded_files(uploaded_files):
@@ -195,12 +259,12 @@ def validate_uploaded_files(uploaded_files):
         issues = []
 
         # Check file extension
-        file_ext = file.name.lower().split('.')[-1]
-        if file_ext not in ['pdf', 'docx', 'doc']:
+        file_ext = file.name.rpartition('.')[2].lower()
+        if file_ext not in ALLOWED_EXTENSIONS:
             issues.append(f"{file.name}: Unsupported format ({file_ext})")
 
         # Check file size (50MB for PDF, 10MB for Word)
-        max_size = 50 * 1024 * 1024 if file_ext == 'pdf' else 10 * 1024 * 1024
+        max_size = MAX_FILE_SIZES.get(file_ext, 10 << 20)
         if file.size > max_size:
             max_size_mb = max_size / (1024 * 1024)
             issues.append(
@@ -214,20 +278,44 @@ def validate_uploaded_files(uploaded_files):
         if issues:
             invalid_files.extend(issues)
         else:
-            valid_files.append(file)
+            # Read the bytes once; extraction works from this copy
+            valid_files.append(
+                ResumeInput(name=file.name, ext=file_ext,
+                            data=file.getvalue()))
 
     return valid_files, invalid_files
 
 
+@st.cache_resource(show_spinner=False, ttl=API_KEY_CACHE_TTL)
+def _resolve_api_key():
+    """Resolve the OpenRouter API key, re-reading it periodically so a rotated key is picked up"""
+    return os.getenv("DEEPSEEK_API_KEY") or st.secrets.get("DEEPSEEK_API_KEY")
+
+
+def get_api_key():
+    """Return the cached API key, re-resolving it while none is configured"""
+    api_key = _resolve_api_key()
+    if not api_key:
+        # Don't pin a missing key; a secret added later is picked up on rerun
+        _resolve_api_key.clear()
+    return api_key
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def get_services(api_key):
+    """Build the processors and AI parser once per process, keeping only the current API key's"""
+    return SimpleNamespace(pdf=PDFProcessor(),
+                           word=WordProcessor(),
+                           ai=AIParser(api_key))
+
+
 def check_credentials():
     """Check API credentials availability"""
     deepseek_status = False
 
     try:
         # Check OpenRouter API key
-        api_key = os.getenv("DEEPSEEK_API_KEY") or st.secrets.get(
-            "DEEPSEEK_API_KEY")
-        if api_key:
+        if get_api_key():
             deepseek_status = True
         else:
             st.error("❌ DEEPSEEK_API_KEY not found in environment or secrets")
@@ -238,11 +326,13 @@ def check_credentials():
     return {'deepseek_status': deepseek_status}
 
 
-def process_resumes(uploaded_files):
+def process_resumes(resumes):
     """Enhanced resume processing with comprehensive debugging"""
     st.session_state.processing_in_progress = True
     st.session_state.processing_complete = False
     st.session_state.processed_candidates = []
+    st.session_state.successful_count = 0
+    st.session_state.excel_report = None
 
     debug_logger = st.session_state.debug_logger
 
@@ -250,21 +340,16 @@ def process_resumes(uploaded_files):
         # Initialize services
         with st.spinner("🔧 Initializing services..."):
             try:
-                pdf_processor = PDFProcessor()
-                word_processor = WordProcessor()
-
                 # Get API key from environment or secrets
-                api_key = os.getenv("DEEPSEEK_API_KEY")
-                if not api_key:
-                    try:
-                        api_key = st.secrets["DEEPSEEK_API_KEY"]
-                    except:
-                        api_key = None
-                
+                api_key = get_api_key()
                 if not api_key:
                     raise Exception("DEEPSEEK_API_KEY not found in environment variables or secrets")
                     
-                ai_parser = AIParser(api_key)
+                # Reused across runs so the API session stays warm
+                services = get_services(api_key)
+                pdf_processor = services.pdf
+                word_processor = services.word
+                ai_parser = services.ai
 
                 st.success("✅ Services initialized successfully")
 
@@ -277,136 +362,255 @@ def process_resumes(uploaded_files):
         progress_container = st.container()
         with progress_container:
             progress_bar = st.progress(0)
-            status_text = st.empty()
-            error_summary = st.empty()
+            status_slot = st.empty()
 
-        total_files = len(uploaded_files)
+        total_files = len(resumes)
         successful_processes = 0
         extraction_failures = 0
         parsing_failures = 0
+        api_semaphore = threading.Semaphore(MAX_CONCURRENT_API_CALLS)
+        last_progress_update = 0.0
+
+        def summarize_counts():
+            return (f"✅ Successful: {successful_processes} | "
+                    f"⚠️ Extraction Failed: {extraction_failures} | "
+                    f"🤖 Parsing Failed: {parsing_failures}")
+
+        def failed_result(filename, error_key):
+            return {
+                'filename': filename,
+                error_key: True,
+                **ai_parser._create_empty_structure()
+            }
+
+        def extract_single_file(resume):
+            """
+            Extract and validate text for one file.
 
-        def process_single_file(uploaded_file):
-            """Process a single file with comprehensive error tracking"""
-            filename = uploaded_file.name
-            file_extension = filename.lower().split('.')[-1]
+            Returns (result, extracted_text): result is a finished candidate
+            dict when the file cannot go on to AI parsing, otherwise None.
+            """
+            filename = resume.name
+            file_extension = resume.ext
             extracted_text = ""
 
             try:
                 # Text extraction phase
                 if file_extension == 'pdf':
-                    extracted_text = pdf_processor.process_pdf_file(
-                        uploaded_file)
+                    extracted_text = pdf_processor.process_pdf_bytes(
+                        resume.data, filename)
                 elif file_extension in ['doc', 'docx']:
-                    extracted_text = word_processor.process_word_file(
-                        uploaded_file)
+                    extracted_text = word_processor.process_word_bytes(
+                        resume.data, filename)
                 else:
                     debug_logger.log_error(
                         "File Processing", filename,
                         f"Unsupported file type: {file_extension}")
-                    return None
+                    return failed_result(filename, 'extraction_error'), None
 
                 # Validate extracted text
                 if not debug_logger.validate_extracted_text(
                         extracted_text, filename):
-                    return {
-                        'filename': filename,
-                        'extraction_error': True,
-                        **ai_parser._create_empty_structure()
-                    }
+                    return failed_result(filename, 'extraction_error'), None
 
                 debug_logger.log_text_extraction(filename, extracted_text,
                                                  file_extension.upper())
 
-                # AI parsing phase
-                parsed_data = ai_parser.parse_resume(extracted_text, filename)
-                parsed_data['filename'] = filename
+                return None, extracted_text
 
+            except Exception as e:
+                debug_logger.log_error("File Processing", filename, e)
+                return failed_result(filename, 'processing_error'), None
+
+        def parse_batch(batch):
+            """AI-parse a batch of (upload digest, filename, text, text digest) entries in one API call"""
+            # Throttled so extraction stays parallel without overrunning
+            # the DeepSeek rate limit
+            with api_semaphore:
+                parsed_list = ai_parser.parse_resume_batch(
+                    [(filename, text) for _, filename, text, _ in batch],
+                    debug_mode=debug_logger.debug_mode)
+
+            for (_, filename, extracted_text, _), parsed_data in zip(
+                    batch, parsed_list):
+                parsed_data['filename'] = filename
                 debug_logger.log_ai_parsing(filename, len(extracted_text),
                                             "Success", parsed_data)
 
-                return parsed_data
+            return parsed_list
 
-            except Exception as e:
-                debug_logger.log_error("File Processing", filename, e)
-                return {
-                    'filename': filename,
-                    'processing_error': True,
-                    **ai_parser._create_empty_structure()
-                }
-
-        # Process files with optimized batching for speed and reliability
+        # Extract every file on one persistent pool and feed the extracted
+        # texts to the AI in batches as soon as enough are ready
         results = []
-
-        # Use maximum parallelism for 16-core systems
-        batch_size = 3
-        max_workers = 5 
-        
-        # Process in batches
-        for batch_start in range(0, len(uploaded_files), batch_size):
-            batch_end = min(batch_start + batch_size, len(uploaded_files))
-            batch_files = uploaded_files[batch_start:batch_end]
-            
-            # Process current batch in parallel
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                future_to_file = {
-                    executor.submit(process_single_file, f): f 
-                    for f in batch_files
-                }
-                
-                for future in as_completed(future_to_file):
-                    uploaded_file = future_to_file[future]
-                    
-                    try:
-                        result = future.result(timeout=90)  # 90 second timeout per file
-                        
-                        if result:
-                            results.append(result)
-                            
-                            # Check if extraction was successful
-                            if result.get('extraction_error'):
-                                extraction_failures += 1
-                            elif not any([
-                                    result.get('first_name'),
-                                    result.get('email'),
-                                    result.get('current_job_title')
-                            ]):
-                                parsing_failures += 1
-                            else:
-                                successful_processes += 1
-                                
-                    except Exception as e:
-                        debug_logger.log_error("File Processing", uploaded_file.name, e)
+        pending_batch = []
+        # Identical extracted texts are parsed once: parsed_by_digest holds
+        # finished results, duplicates_by_digest the (upload digest, file
+        # name) pairs still waiting on one
+        parsed_by_digest = {}
+        duplicates_by_digest = {}
+
+        # Byte-identical uploads are processed once; duplicate_uploads maps
+        # each upload digest to the names of the later uploads that reuse
+        # its result. File names are not unique, so results are matched by
+        # digest, never by name
+        unique_resumes = []
+        duplicate_uploads = {}
+        for resume in resumes:
+            digest = hashlib.blake2b(resume.data, digest_size=16).digest()
+            if digest in duplicate_uploads:
+                duplicate_uploads[digest].append(resume.name)
+            else:
+                duplicate_uploads[digest] = []
+                unique_resumes.append((digest, resume))
+
+        duplicate_count = total_files - len(unique_resumes)
+        if duplicate_count:
+            st.info(f"♻️ {duplicate_count} duplicate file(s) skipped; "
+                    "their results are copied from the matching upload")
+
+        # Per-file errors are gathered into one table after the run
+        debug_logger.collect_errors()
+
+        with ThreadPoolExecutor(
+                max_workers=min(MAX_WORKERS, len(unique_resumes))) as executor:
+            queued_resumes = iter(unique_resumes)
+            extract_futures = {}
+            parse_futures = {}
+
+            def submit_extractions():
+                """Top the extraction queue back up to its bound"""
+                for upload_digest, resume in islice(
+                        queued_resumes,
+                        MAX_PENDING_EXTRACTIONS - len(extract_futures)):
+                    extract_futures[executor.submit(
+                        extract_single_file, resume)] = upload_digest, resume
+
+            def next_batch_size():
+                """Resumes to send in the next batch, or 0 to wait for more"""
+                batch_chars = 0
+                for count, (_, _, text, _) in enumerate(pending_batch, 1):
+                    batch_chars += len(text)
+                    if batch_chars > AI_BATCH_CHAR_BUDGET:
+                        return max(count - 1, 1)
+                    if count == AI_BATCH_SIZE:
+                        return count
+                # Send the remainder once extraction has finished
+                return 0 if extract_futures else len(pending_batch)
+
+            submit_extractions()
+
+            while extract_futures or parse_futures:
+                done, _ = wait([*extract_futures, *parse_futures],
+                               return_when=FIRST_COMPLETED)
+                # (upload digest, result) pairs completed this round
+                finished = []
+
+                for future in done:
+                    if future in extract_futures:
+                        upload_digest, resume = extract_futures.pop(future)
+                        try:
+                            result, extracted_text = future.result()
+                        except Exception as e:
+                            debug_logger.log_error("File Processing",
+                                                   resume.name, e)
+                            result = failed_result(resume.name,
+                                                   'processing_error')
+
+                        if result is not None:
+                            finished.append((upload_digest, result))
+                            continue
+
+                        digest = hashlib.blake2b(
+                            extracted_text.encode('utf-8'),
+                            digest_size=16).digest()
+                        if digest in parsed_by_digest:
+                            finished.append(
+                                (upload_digest,
+                                 {**parsed_by_digest[digest],
+                                  'filename': resume.name}))
+                        elif digest in duplicates_by_digest:
+                            duplicates_by_digest[digest].append(
+                                (upload_digest, resume.name))
+                        else:
+                            duplicates_by_digest[digest] = []
+                            pending_batch.append((upload_digest, resume.name,
+                                                  extracted_text, digest))
+                    else:
+                        batch = parse_futures.pop(future)
+                        try:
+                            parsed_list = future.result()
+                        except Exception as e:
+                            for upload_digest, filename, _, digest in batch:
+                                for key, name in [
+                                        (upload_digest, filename),
+                                        *duplicates_by_digest.pop(digest)]:
+                                    debug_logger.log_error("File Processing",
+                                                           name, e)
+                                    finished.append(
+                                        (key, failed_result(
+                                            name, 'processing_error')))
+                            continue
+
+                        for (upload_digest, _, _, digest), parsed_data in zip(
+                                batch, parsed_list):
+                            finished.append((upload_digest, parsed_data))
+                            parsed_by_digest[digest] = parsed_data
+                            for key, name in duplicates_by_digest.pop(digest):
+                                finished.append((key, {**parsed_data,
+                                                       'filename': name}))
+
+                submit_extractions()
+
+                # Submit full batches, plus the remainder once extraction ends
+                while batch_size := next_batch_size():
+                    batch = pending_batch[:batch_size]
+                    del pending_batch[:batch_size]
+                    parse_futures[executor.submit(parse_batch, batch)] = batch
+
+                # Copy each result to the uploads with identical bytes
+                for upload_digest, result in finished[:]:
+                    for name in duplicate_uploads.pop(upload_digest, ()):
+                        finished.append((None, {**result, 'filename': name}))
+
+                for _, result in finished:
+                    results.append(result)
+
+                    # Check if extraction was successful
+                    if result.get('extraction_error'):
                         extraction_failures += 1
-                        # Create empty result for failed file
-                        results.append({
-                            'filename': uploaded_file.name,
-                            'processing_error': True,
-                            **ai_parser._create_empty_structure()
-                        })
-
-                    # Update progress
+                    elif not (result.get('first_name')
+                              or result.get('email')
+                              or result.get('current_job_title')):
+                        parsing_failures += 1
+                    else:
+                        successful_processes += 1
+
+                # Coalesce widget refreshes; each one is a websocket round trip
+                now = time.monotonic()
+                if finished and (
+                        now - last_progress_update >= PROGRESS_REFRESH_INTERVAL
+                        or len(results) == total_files):
+                    last_progress_update = now
+
+                    # Update progress and error summary together
                     progress = len(results) / total_files
                     progress_bar.progress(progress)
-                    status_text.text(f"Processed {len(results)} / {total_files} resumes")
-
-                    # Update error summary
-                    error_summary.info(
-                        f"✅ Successful: {successful_processes} | "
-                        f"⚠️ Extraction Failed: {extraction_failures} | "
-                        f"🤖 Parsing Failed: {parsing_failures}")
-            
-            # Minimal delay between batches for maximum speed
-            if batch_end < len(uploaded_files):
-                import time
-                time.sleep(0.1)  # 100ms delay between batches
+                    status_slot.markdown(
+                        f"Processed {len(results)} / {total_files} resumes\n\n"
+                        + summarize_counts())
+
+        debug_logger.flush_errors()
 
         # Store results
         st.session_state.processed_candidates = results
+        st.session_state.successful_count = successful_processes
+        prepare_excel_report(results)
 
         # Final progress update
         progress_bar.progress(1.0)
-        status_text.text(
-            f"Processing complete: {len(results)} files processed")
+        status_slot.markdown(
+            f"Processing complete: {len(results)} files processed\n\n"
+            + summarize_counts())
         st.session_state.processing_complete = True
         st.session_state.processing_in_progress = False
 
@@ -433,6 +637,7 @@ def process_resumes(uploaded_files):
                 )
 
     except Exception as e:
+        debug_logger.flush_errors()
         debug_logger.log_error("System", "Processing Pipeline", e)
         st.session_state.processing_in_progress = False
 
@@ -440,6 +645,24 @@ def process_resumes(uploaded_files):
             st.code(traceback.format_exc())
 
 
+@st.cache_data(max_entries=4, show_spinner=False)
+def build_excel_report(candidates):
+    """Serialize candidates to .xlsx bytes, reused while the results are unchanged"""
+    return ExcelExporter().export_candidates(candidates)
+
+
+def prepare_excel_report(candidates):
+    """Build the Excel report as soon as processing ends so downloading is instant"""
+    try:
+        with st.spinner("📊 Preparing Excel report..."):
+            st.session_state.excel_report = build_excel_report(candidates)
+            timestamp = pd.Timestamp.now().strftime("%Y%m%d_%H%M%S")
+            st.session_state.excel_filename = f"resume_analysis_{timestamp}.xlsx"
+    except Exception as e:
+        st.session_state.excel_report = None
+        st.warning(f"⚠️ Excel report could not be prepared: {str(e)}")
+
+
 def generate_and_download_excel():
     """Generate and auto-download Excel report with enhanced error handling"""
     try:
@@ -448,12 +671,9 @@ def generate_and_download_excel():
             return
 
         with st.spinner("📊 Generating Excel report..."):
-            exporter = ExcelExporter()
-            excel_data = exporter.export_candidates(
+            excel_data = build_excel_report(
                 st.session_state.processed_candidates)
 
-            # Create download link
-            b64 = base64.b64encode(excel_data).decode()
             timestamp = pd.Timestamp.now().strftime("%Y%m%d_%H%M%S")
             filename = f"resume_analysis_{timestamp}.xlsx"
 
@@ -462,8 +682,7 @@ def generate_and_download_excel():
                 label="📥 Download Excel Report",
                 data=excel_data,
                 file_name=filename,
-                mime=
-                "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                mime=XLSX_MIME,
                 type="primary")
 
             st.success(f"✅ Excel report generated successfully: {filename}")
@@ -3,12 +3,17 @@ import streamlit as st
 import os
 from datetime import datetime
 
+# Markers checked before a text is sent to the AI parser
+RESUME_INDICATORS = ('email', '@', 'phone', 'experience', 'education', 'skills', 'work', 'job')
+MIN_RESUME_INDICATORS = 2
+
 class DebugLogger:
     """Comprehensive debugging and logging system for resume processing"""
     
     def __init__(self):
         self.setup_logging()
         self.debug_mode = os.getenv("DEBUG_MODE", "false").lower() == "true"
+        self.pending_errors = None  # Collected errors while a batch is running
         
     def setup_logging(self):
         """Setup logging configuration"""
@@ -57,12 +62,29 @@ class DebugLogger:
         """Log detailed error information"""
         error_msg = f"Error in {step} for {filename}: {str(error)}"
         self.logger.error(error_msg)
+        
+        # During a batch, errors are shown together by flush_errors
+        if self.pending_errors is not None:
+            self.pending_errors.append({'Step': step, 'File': filename, 'Error': str(error)})
+            return
+            
         st.error(f"❌ {error_msg}")
         
         if self.debug_mode:
             with st.expander(f"🐛 Debug: Error details for {filename}"):
                 st.code(str(error))
                 
+    def collect_errors(self):
+        """Start collecting errors instead of rendering each one as it happens"""
+        self.pending_errors = []
+        
+    def flush_errors(self):
+        """Render all collected errors in a single table and stop collecting"""
+        errors, self.pending_errors = self.pending_errors, None
+        if errors:
+            with st.expander(f"❌ {len(errors)} processing error(s)", expanded=True):
+                st.dataframe(errors, use_container_width=True, hide_index=True)
+                
     def validate_extracted_text(self, text, filename):
         """Validate extracted text quality"""
         if not text or not text.strip():
@@ -74,12 +96,16 @@ class DebugLogger:
             self.log_error("Text Validation", filename, f"Text too short: {len(text)} characters")
             return False
             
-        # Check for common resume indicators
-        resume_indicators = ['email', '@', 'phone', 'experience', 'education', 'skills', 'work', 'job']
+        # Check for common resume indicators, stopping as soon as enough are found
         text_lower = text.lower()
-        found_indicators = [indicator for indicator in resume_indicators if indicator in text_lower]
+        found_indicators = []
+        for indicator in RESUME_INDICATORS:
+            if indicator in text_lower:
+                found_indicators.append(indicator)
+                if len(found_indicators) >= MIN_RESUME_INDICATORS:
+                    break
         
-        if len(found_indicators) < 2:
+        if len(found_indicators) < MIN_RESUME_INDICATORS:
             self.log_error("Text Validation", filename, f"Text doesn't appear to be a resume. Found indicators: {found_indicators}")
             return False
             
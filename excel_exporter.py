@@ -1,11 +1,23 @@
-import pandas as pd
 import io
 from typing import List, Dict, Any
 import streamlit as st
 from datetime import datetime
-from openpyxl.styles import NamedStyle, Font, PatternFill
+import xlsxwriter
 import logging
 
+# (column header, candidate field) pairs for the Resume Data sheet
+EXPORT_COLUMNS = (
+    ('First Name', 'first_name'),
+    ('Last Name', 'last_name'),
+    ('Mobile', 'mobile'),
+    ('Email', 'email'),
+    ('Current Job Title', 'current_job_title'),
+    ('Current Company', 'current_company'),
+    ('Previous Job Title', 'previous_job_title'),
+    ('Previous Company', 'previous_company'),
+    ('Source File', 'filename'),
+)
+
 class ExcelExporter:
     """Enhanced Excel export with better formatting and error handling"""
     
@@ -28,45 +40,34 @@ class ExcelExporter:
             
             self.logger.info(f"Exporting {len(candidates_data)} candidates to Excel")
             
-            # Prepare data for DataFrame
-            excel_data = []
-            
-            for i, candidate in enumerate(candidates_data, 1):
-                row = {
-                    'Sr. No.': i,
-                    'First Name': candidate.get('first_name', ''),
-                    'Last Name': candidate.get('last_name', ''),
-                    'Mobile': candidate.get('mobile', ''),
-                    'Email': candidate.get('email', ''),
-                    'Current Job Title': candidate.get('current_job_title', ''),
-                    'Current Company': candidate.get('current_company', ''),
-                    'Previous Job Title': candidate.get('previous_job_title', ''),
-                    'Previous Company': candidate.get('previous_company', ''),
-                    'Source File': candidate.get('filename', '')
-                }
-                excel_data.append(row)
-            
-            # Create DataFrame
-            df = pd.DataFrame(excel_data)
+            # Prepare rows for the main sheet
+            headers = ['Sr. No.'] + [header for header, _ in EXPORT_COLUMNS]
+            rows = [
+                [i] + [candidate.get(field, '') for _, field in EXPORT_COLUMNS]
+                for i, candidate in enumerate(candidates_data, 1)
+            ]
             
             # Create Excel writer object
             output = io.BytesIO()
             
-            with pd.ExcelWriter(output, engine='openpyxl') as writer:
+            # constant_memory flushes each row as soon as it is written rather
+            # than holding the whole workbook as Python objects; cell text is
+            # written verbatim, never turned into formulas or hyperlinks
+            workbook = xlsxwriter.Workbook(output, {
+                'constant_memory': True,
+                'strings_to_formulas': False,
+                'strings_to_urls': False,
+            })
+            
+            try:
                 # Write main data sheet
-                df.to_excel(writer, sheet_name='Resume Data', index=False)
-                
-                # Get the workbook and worksheet
-                workbook = writer.book
-                worksheet = writer.sheets['Resume Data']
-                
-                # Create styles
-                self._apply_excel_formatting(workbook, worksheet, df)
+                self._write_data_sheet(workbook, headers, rows)
                 
                 # Add summary sheet
-                self._add_summary_sheet(writer, candidates_data)
+                self._add_summary_sheet(workbook, candidates_data)
+            finally:
+                workbook.close()
             
-            output.seek(0)
             self.logger.info("Excel export completed successfully")
             return output.getvalue()
             
@@ -75,58 +76,37 @@ class ExcelExporter:
             st.error(f"❌ Error creating Excel file: {str(e)}")
             raise e
     
-    def _apply_excel_formatting(self, workbook, worksheet, df):
-        """Apply enhanced formatting to Excel worksheet"""
-        try:
-            # Create header style
-            header_style = NamedStyle(name="header_style")
-            header_style.font = Font(bold=True, color="FFFFFF")
-            header_style.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+    def _write_data_sheet(self, workbook, headers, rows):
+        """Write the formatted Resume Data sheet"""
+        worksheet = workbook.add_worksheet('Resume Data')
 
-            # Register the style to the workbook
-            if "header_style" not in workbook.named_styles:
-                workbook.add_named_style(header_style)
+        # Create header and bordered cell styles
+        header_format = workbook.add_format({
+            'bold': True,
+            'font_color': '#FFFFFF',
+            'bg_color': '#366092',
+            'border': 1
+        })
+        cell_format = workbook.add_format({'border': 1})
 
-            # Apply style to header row
-            for cell in worksheet[1]:
-                cell.style = header_style
-            
-            # Auto-adjust column widths
-            for column in worksheet.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                
-                for cell in column:
-                    try:
-                        if cell.value and len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                
-                # Set width with padding, but cap at reasonable maximum
-                adjusted_width = min(max_length + 3, 50)
-                worksheet.column_dimensions[column_letter].width = adjusted_width
+        # Column widths must be set before rows are streamed out
+        self._set_column_widths(worksheet, headers, rows, padding=3, cap=50)
             
-            # Add borders and alternate row colors
-            from openpyxl.styles import Border, Side
-            
-            thin_border = Border(
-                left=Side(style='thin'),
-                right=Side(style='thin'),
-                top=Side(style='thin'),
-                bottom=Side(style='thin')
+        worksheet.write_row(0, 0, headers, header_format)
+        for row_idx, row in enumerate(rows, 1):
+            worksheet.write_row(row_idx, 0, row, cell_format)
+    
+    def _set_column_widths(self, worksheet, headers, rows, padding, cap):
+        """Size each column to its longest value, with padding, but cap at reasonable maximum"""
+        for col, header in enumerate(headers):
+            max_length = max(
+                (len(str(row[col])) for row in rows if row[col]),
+                default=0
             )
-            
-            # Apply borders to all cells with data
-            for row in worksheet.iter_rows(min_row=1, max_row=len(df) + 1, 
-                                         min_col=1, max_col=len(df.columns)):
-                for cell in row:
-                    cell.border = thin_border
-                    
-        except Exception as e:
-            self.logger.warning(f"Could not apply Excel formatting: {str(e)}")
+            max_length = max(max_length, len(header))
+            worksheet.set_column(col, col, min(max_length + padding, cap))
     
-    def _add_summary_sheet(self, writer, candidates_data):
+    def _add_summary_sheet(self, workbook, candidates_data):
         """Add summary statistics sheet"""
         try:
             # Calculate summary statistics
@@ -149,34 +129,19 @@ class ExcelExporter:
                 ['Total Files Processed', total_candidates, '']
             ]
             
-            # Create summary DataFrame
-            summary_df = pd.DataFrame(summary_data[1:], columns=summary_data[0])
-            
-            # Write to Excel
-            summary_df.to_excel(writer, sheet_name='Summary', index=False)
+            summary_worksheet = workbook.add_worksheet('Summary')
             
             # Format summary sheet
-            summary_worksheet = writer.sheets['Summary']
-            
-            # Apply header formatting
-            for cell in summary_worksheet[1]:
-                cell.font = Font(bold=True)
-                cell.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
+            header_format = workbook.add_format({'bold': True, 'bg_color': '#CCCCCC'})
             
             # Auto-adjust column widths
-            for column in summary_worksheet.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                
-                for cell in column:
-                    try:
-                        if cell.value and len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                
-                adjusted_width = min(max_length + 2, 30)
-                summary_worksheet.column_dimensions[column_letter].width = adjusted_width
+            self._set_column_widths(summary_worksheet, summary_data[0], summary_data[1:],
+                                    padding=2, cap=30)
+            
+            # Write to Excel
+            summary_worksheet.write_row(0, 0, summary_data[0], header_format)
+            for row_idx, row in enumerate(summary_data[1:], 1):
+                summary_worksheet.write_row(row_idx, 0, row)
                 
         except Exception as e:
             self.logger.warning(f"Could not create summary sheet: {str(e)}")
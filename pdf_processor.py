@@ -33,22 +33,34 @@ class PDFProcessor:
             Extracted text as string
         """
         uploaded_file.seek(0)
-        file_content = uploaded_file.read()
-        
-        # Try multiple extraction methods
-        methods = [
-            ("PyPDF2", self._extract_with_pypdf2),
-        ]
+        return self.extract_text_from_bytes(uploaded_file.read(), uploaded_file.name)
+    
+    def extract_text_from_bytes(self, file_content, filename):
+        """
+        Extract text from PDF content using multiple methods with fallbacks
         
-        if PDFPLUMBER_AVAILABLE:
-            methods.append(("pdfplumber", self._extract_with_pdfplumber))
+        Args:
+            file_content: PDF file content as bytes
+            filename: Name of the source file for logging
             
+        Returns:
+            Extracted text as string
+        """
+        # Try multiple extraction methods, fastest first: PyMuPDF parses in C
+        # and is several times quicker than the pure-Python PyPDF2 reader
+        methods = []
+
         if PYMUPDF_AVAILABLE:
             methods.append(("PyMuPDF", self._extract_with_pymupdf))
+
+        methods.append(("PyPDF2", self._extract_with_pypdf2))
+
+        if PDFPLUMBER_AVAILABLE:
+            methods.append(("pdfplumber", self._extract_with_pdfplumber))
         
         for method_name, method_func in methods:
             try:
-                self.logger.info(f"Trying {method_name} for {uploaded_file.name}")
+                self.logger.info(f"Trying {method_name} for {filename}")
                 text = method_func(file_content)
                 
                 if text and text.strip() and len(text.strip()) > 50:
@@ -62,7 +74,7 @@ class PDFProcessor:
                 continue
         
         # If all methods fail
-        st.error(f"❌ All PDF extraction methods failed for {uploaded_file.name}")
+        st.error(f"❌ All PDF extraction methods failed for {filename}")
         return ""
     
     def _extract_with_pypdf2(self, file_content):
@@ -107,28 +119,35 @@ class PDFProcessor:
         return '\n'.join(text_content)
     
     def _extract_with_pymupdf(self, file_content):
-        """Extract text using PyMuPDF (fallback method)"""
+        """Extract text using PyMuPDF (primary method)"""
         if not PYMUPDF_AVAILABLE:
             raise ImportError("PyMuPDF not available")
             
-        file_like_object = BytesIO(file_content)
         text_content = []
         
-        pdf_document = fitz.open(stream=file_content, filetype="pdf")
+        # PyMuPDF's default text flags minus ligature preservation, so
+        # ligatures come back as ordinary letters
+        flags = fitz.TEXTFLAGS_TEXT & ~fitz.TEXT_PRESERVE_LIGATURES
         
-        for page_num in range(pdf_document.page_count):
-            try:
-                page = pdf_document[page_num]
-                page_text = page.get_text()
+        pdf_document = fitz.open(stream=file_content, filetype="pdf")
+        try:
+            if pdf_document.needs_pass:
+                self.logger.warning("PyMuPDF cannot read password-protected PDF")
+                return ""
                 
-                if page_text and page_text.strip():
-                    text_content.append(page_text.strip())
+            for page_num, page in enumerate(pdf_document):
+                try:
+                    page_text = page.get_text("text", flags=flags)
                     
-            except Exception as page_error:
-                self.logger.warning(f"PyMuPDF failed on page {page_num + 1}: {str(page_error)}")
-                continue
-        
-        pdf_document.close()
+                    if page_text and page_text.strip():
+                        text_content.append(page_text.strip())
+                        
+                except Exception as page_error:
+                    self.logger.warning(f"PyMuPDF failed on page {page_num + 1}: {str(page_error)}")
+                    continue
+        finally:
+            pdf_document.close()
+            
         return '\n'.join(text_content)
     
     def process_pdf_file(self, uploaded_file):
@@ -138,22 +157,38 @@ class PDFProcessor:
         Args:
             uploaded_file: Streamlit uploaded file object
             
+        Returns:
+            Extracted text as string
+        """
+        uploaded_file.seek(0)
+        return self.process_pdf_bytes(uploaded_file.read(), uploaded_file.name)
+    
+    def process_pdf_bytes(self, file_content, filename):
+        """
+        Process PDF content that has already been read into memory
+        
+        Args:
+            file_content: PDF file content as bytes
+            filename: Name of the source file for logging
+            
         Returns:
             Extracted text as string
         """
         try:
-            if uploaded_file.size == 0:
-                self.logger.error(f"PDF file {uploaded_file.name} is empty")
+            file_size = len(file_content)
+            
+            if file_size == 0:
+                self.logger.error(f"PDF file {filename} is empty")
                 return ""
                 
-            if uploaded_file.size > 50 * 1024 * 1024:  # 50MB limit
-                self.logger.error(f"PDF file {uploaded_file.name} is too large ({uploaded_file.size} bytes)")
-                st.error(f"❌ File {uploaded_file.name} is too large (max 50MB)")
+            if file_size > 50 * 1024 * 1024:  # 50MB limit
+                self.logger.error(f"PDF file {filename} is too large ({file_size} bytes)")
+                st.error(f"❌ File {filename} is too large (max 50MB)")
                 return ""
                 
-            return self.extract_text_from_pdf(uploaded_file)
+            return self.extract_text_from_bytes(file_content, filename)
             
         except Exception as e:
-            self.logger.error(f"Error processing PDF {uploaded_file.name}: {str(e)}")
-            st.error(f"❌ Error processing PDF {uploaded_file.name}: {str(e)}")
+            self.logger.error(f"Error processing PDF {filename}: {str(e)}")
+            st.error(f"❌ Error processing PDF {filename}: {str(e)}")
             return ""
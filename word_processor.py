@@ -2,6 +2,21 @@ import docx
 import streamlit as st
 from io import BytesIO
 import logging
+import zipfile
+import xml.etree.ElementTree as ET
+
+# WordprocessingML tags read by the direct XML extraction path
+W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+W_P = W_NS + 'p'
+W_T = W_NS + 't'
+W_TAB = W_NS + 'tab'
+W_PTAB = W_NS + 'ptab'
+W_NO_BREAK_HYPHEN = W_NS + 'noBreakHyphen'
+W_BREAKS = (W_NS + 'br', W_NS + 'cr')
+
+# Text boxes are written twice inside mc:AlternateContent; only the
+# mc:Choice copy is read, the legacy mc:Fallback copy is skipped
+MC_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
 
 class WordProcessor:
     """Enhanced Word document (.docx) text extraction with validation"""
@@ -13,12 +28,75 @@ class WordProcessor:
         """
         Extract text from DOCX file with enhanced error handling.
         
+        Reads the document XML directly and only builds the python-docx
+        object model if that fails or finds no text.
+        
         Args:
             file_content: File content as bytes
             
         Returns:
             Extracted text as string
         """
+        try:
+            extracted_text = self._extract_with_xml(file_content)
+            if extracted_text.strip():
+                return extracted_text
+            self.logger.warning("DOCX XML extraction found no text, falling back to python-docx")
+        except Exception as e:
+            self.logger.warning(f"DOCX XML extraction failed, falling back to python-docx: {str(e)}")
+            
+        return self._extract_with_python_docx(file_content)
+
+    def _extract_with_xml(self, file_content):
+        """Extract paragraph text straight from the body, header and footer XML parts"""
+        text_content = []
+        
+        with zipfile.ZipFile(BytesIO(file_content)) as archive:
+            parts = ['word/document.xml'] + sorted(
+                name for name in archive.namelist()
+                if name.startswith(('word/header', 'word/footer')) and name.endswith('.xml')
+            )
+            
+            for part in parts:
+                # One buffer per open paragraph; text boxes nest paragraphs
+                open_paragraphs = []
+                fallback_depth = 0
+                with archive.open(part) as xml_file:
+                    for event, element in ET.iterparse(xml_file, events=('start', 'end')):
+                        if element.tag == MC_FALLBACK:
+                            fallback_depth += 1 if event == 'start' else -1
+                        elif fallback_depth:
+                            pass
+                        elif element.tag == W_P:
+                            if event == 'start':
+                                open_paragraphs.append([])
+                            else:
+                                paragraph_text = ''.join(open_paragraphs.pop()).strip()
+                                if paragraph_text and open_paragraphs:
+                                    # Text box paragraphs stay in place as lines of the enclosing paragraph
+                                    open_paragraphs[-1].append(f'\n{paragraph_text}\n')
+                                elif paragraph_text:
+                                    text_content.append(paragraph_text)
+                        elif event == 'end' and open_paragraphs:
+                            if element.tag == W_T:
+                                open_paragraphs[-1].append(element.text or '')
+                            elif element.tag in (W_TAB, W_PTAB):
+                                open_paragraphs[-1].append('\t')
+                            elif element.tag == W_NO_BREAK_HYPHEN:
+                                open_paragraphs[-1].append('-')
+                            elif element.tag in W_BREAKS:
+                                open_paragraphs[-1].append('\n')
+                                
+                        # Text is buffered as it is read, so each finished
+                        # element can be dropped to keep the parse streaming
+                        if event == 'end':
+                            element.clear()
+                                
+        self.logger.info(f"DOCX XML extraction stats - Paragraphs: {len(text_content)}, Parts: {len(parts)}")
+        return "\n".join(text_content)
+
+    def _extract_with_python_docx(self, file_content):
+        """Extract text through the python-docx object model (fallback method)"""
         try:
             # Load the document from bytes
             doc = docx.Document(BytesIO(file_content))
@@ -75,23 +153,37 @@ class WordProcessor:
         Args:
             uploaded_file: Streamlit uploaded file object
             
+        Returns:
+            Extracted text as string
+        """
+        uploaded_file.seek(0)
+        return self.process_word_bytes(uploaded_file.read(), uploaded_file.name)
+
+    def process_word_bytes(self, file_content, filename):
+        """
+        Process Word content that has already been read into memory.
+        
+        Args:
+            file_content: File content as bytes
+            filename: Name of the source file, used for format detection and logging
+            
         Returns:
             Extracted text as string
         """
         try:
             # Validate file
-            if uploaded_file.size == 0:
-                self.logger.error(f"Word file {uploaded_file.name} is empty")
-                st.error(f"❌ File {uploaded_file.name} is empty")
+            file_size = len(file_content)
+            if file_size == 0:
+                self.logger.error(f"Word file {filename} is empty")
+                st.error(f"❌ File {filename} is empty")
                 return ""
                 
-            if uploaded_file.size > 10 * 1024 * 1024:  # 10MB limit for Word docs
-                self.logger.error(f"Word file {uploaded_file.name} is too large ({uploaded_file.size} bytes)")
-                st.error(f"❌ File {uploaded_file.name} is too large (max 10MB)")
+            if file_size > 10 * 1024 * 1024:  # 10MB limit for Word docs
+                self.logger.error(f"Word file {filename} is too large ({file_size} bytes)")
+                st.error(f"❌ File {filename} is too large (max 10MB)")
                 return ""
 
-            uploaded_file.seek(0) 
-            file_extension = uploaded_file.name.lower().split('.')[-1]
+            file_extension = filename.rpartition('.')[2].lower()
 
             if file_extension not in ["docx", "doc"]:
                 self.logger.error(f"Unsupported file format: {file_extension}")
@@ -100,27 +192,20 @@ class WordProcessor:
 
             # Handle .doc files (older format)
             if file_extension == "doc":
-                st.warning(f"⚠️ {uploaded_file.name} is in older .doc format. Please convert to .docx for better extraction.")
-                return ""
-
-            file_content = uploaded_file.read()
-            
-            if len(file_content) == 0:
-                self.logger.error(f"No content read from {uploaded_file.name}")
-                st.error(f"❌ No content could be read from {uploaded_file.name}")
+                st.warning(f"⚠️ {filename} is in older .doc format. Please convert to .docx for better extraction.")
                 return ""
 
             extracted_text = self.extract_text_from_docx(file_content)
             
             if not extracted_text or not extracted_text.strip():
-                self.logger.warning(f"No text extracted from {uploaded_file.name}")
-                st.warning(f"⚠️ No readable text found in {uploaded_file.name}")
+                self.logger.warning(f"No text extracted from {filename}")
+                st.warning(f"⚠️ No readable text found in {filename}")
                 return ""
                 
-            self.logger.info(f"Successfully extracted {len(extracted_text)} characters from {uploaded_file.name}")
+            self.logger.info(f"Successfully extracted {len(extracted_text)} characters from {filename}")
             return extracted_text
 
         except Exception as e:
-            self.logger.error(f"Error processing Word file {uploaded_file.name}: {str(e)}")
-            st.error(f"❌ Error processing {uploaded_file.name}: {str(e)}")
+            self.logger.error(f"Error processing Word file {filename}: {str(e)}")
+            st.error(f"❌ Error processing {filename}: {str(e)}")
             return ""